@@ -4,10 +4,109 @@ Audit Dependencies - Run npm audit and outdated checks
 """
 
 import subprocess
+import functools
+import io
 import json
+import re
 import sys
+import tempfile
+from itertools import islice
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # Optional - fall back to buffering the whole report
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
+
+
+# Only the first N advisories are reported, so streaming can stop collecting after that
+MAX_ADVISORIES = 10
+
+# npm audit text summary line:
+# "found 20 vulnerabilities (3 low, 10 moderate, 5 high, 2 critical)"
+AUDIT_SUMMARY_PATTERN = re.compile(r'found (\d+) vulnerabilit(?:y|ies)(?:\s+\(([^)\n]*)\))?')
+SEVERITY_PATTERNS = {
+    severity: re.compile(rf'(\d+) {severity}\b')
+    for severity in ("critical", "high", "moderate", "low")
+}
+
+# Leading major[.minor[.patch]] of a version string, e.g. "18.2.0" or "5.0.0-beta.1"
+SEMVER_PATTERN = re.compile(r'^(\d+)(?:\.(\d+))?(?:\.(\d+))?')
+
+
+# Status messages are collected here and written to stderr in one go on exit
+_log_buffer = io.StringIO()
+
+
+def log(message=""):
+    """Queue a status message for stderr"""
+    _log_buffer.write(message + "\n")
+
+
+def flush_log():
+    """Write all queued status messages to stderr"""
+    sys.stderr.write(_log_buffer.getvalue())
+    sys.stderr.flush()
+
+
+def load_json(data):
+    """Parse JSON text or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def dump_json_line(data):
+    """Serialize data as a single line of JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def emit_result(result, jsonl=False):
+    """Print the result as indented JSON, or as JSON lines with --jsonl
+
+    JSON lines mode writes a summary line followed by one line per
+    vulnerable package and per outdated package, so consumers can act on
+    each entry without buffering the whole report.
+    """
+    if not jsonl:
+        print(dump_json(result))
+        return
+
+    audit = result.get("audit", {})
+    outdated = audit.get("outdated", {})
+    summary = {key: value for key, value in result.items() if key != "audit"}
+    if audit:
+        summary["vulnerabilities"] = audit.get("vulnerabilities", {})
+        summary["outdatedCount"] = outdated.get("count", 0)
+
+    sys.stdout.write(dump_json_line({"type": "summary", **summary}) + "\n")
+    for package in audit.get("packages", []):
+        sys.stdout.write(dump_json_line({"type": "vulnerability", **package}) + "\n")
+    for package in outdated.get("packages", []):
+        record = {
+            "type": "outdated",
+            "name": package["name"],
+            "current": package["current"],
+            "latest": package["latest"],
+            "updateType": package["type"]
+        }
+        sys.stdout.write(dump_json_line(record) + "\n")
+    sys.stdout.flush()
+
 
 def run_npm_audit():
     """Run npm audit and parse results"""
@@ -18,24 +117,99 @@ def run_npm_audit():
             "details": "Not in a Node.js project directory"
         }
 
-    print("→ Running npm audit...", file=sys.stderr)
+    log("→ Running npm audit...")
+
+    if ijson is not None:
+        return stream_npm_audit()
 
     # Run npm audit with JSON output
     result = subprocess.run(
         ['npm', 'audit', '--json'],
-        capture_output=True,
-        text=True
+        capture_output=True
     )
 
     try:
-        audit_data = json.loads(result.stdout)
-    except json.JSONDecodeError:
+        audit_data = load_json(result.stdout)
+    except ValueError:
         # npm audit might fail to parse, try basic parsing
-        return parse_audit_text(result.stdout + result.stderr)
+        return parse_audit_text((result.stdout + result.stderr).decode('utf-8', 'replace'))
 
-    # Extract vulnerability counts
     vulnerabilities = audit_data.get('metadata', {}).get('vulnerabilities', {})
-
+    advisories = islice(audit_data.get('advisories', {}).values(), MAX_ADVISORIES)
+
+    return build_audit_result(vulnerabilities, advisories)
+
+
+class TailReader:
+    """Readable wrapper that remembers the last chunk read from its stream
+
+    Lets the text fallback see the output ijson had already consumed when
+    the JSON turned out to be malformed.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.last_chunk = b''
+
+    def read(self, size=-1):
+        chunk = self.stream.read(size)
+        if chunk:
+            self.last_chunk = chunk
+        return chunk
+
+
+def stream_npm_audit():
+    """Run npm audit and parse its JSON report incrementally with ijson
+
+    Only metadata.vulnerabilities and the fields we report for the first
+    MAX_ADVISORIES advisories are kept, so memory stays flat regardless of
+    how large the report is.
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(
+            ['npm', 'audit', '--json'],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        )
+
+        def text_fallback(output):
+            proc.wait()
+            stderr_file.seek(0)
+            return parse_audit_text((output + stderr_file.read()).decode('utf-8', 'replace'))
+
+        try:
+            with proc.stdout:
+                # npm audit might not emit JSON at all, in which case use the text fallback
+                if not proc.stdout.peek(1).lstrip().startswith(b'{'):
+                    return text_fallback(proc.stdout.read())
+
+                vulnerabilities = {}
+                advisories = {}
+                reader = TailReader(proc.stdout)
+
+                try:
+                    for prefix, event, value in ijson.parse(reader):
+                        if prefix.startswith('metadata.vulnerabilities.') and event == 'number':
+                            vulnerabilities[prefix.rsplit('.', 1)[1]] = value
+                        elif prefix.startswith('advisories.') and event == 'string':
+                            _, advisory_id, field = prefix.split('.', 2)
+                            if field not in ('module_name', 'severity', 'title'):
+                                continue
+                            if advisory_id in advisories or len(advisories) < MAX_ADVISORIES:
+                                advisories.setdefault(advisory_id, {})[field] = value
+                except (ijson.JSONError, ValueError):
+                    # Malformed or truncated JSON, try basic parsing on what is left
+                    return text_fallback(reader.last_chunk + proc.stdout.read())
+        finally:
+            # Always reap npm, even when parsing fails part way through
+            proc.wait()
+
+    return build_audit_result(vulnerabilities, advisories.values())
+
+
+def build_audit_result(vulnerabilities, advisories):
+    """Build vulnerability summary and affected package list"""
+    # Extract vulnerability counts
     vuln_summary = {
         "critical": vulnerabilities.get('critical', 0),
         "high": vulnerabilities.get('high', 0),
@@ -46,14 +220,14 @@ def run_npm_audit():
 
     # Extract affected packages
     packages = []
-    advisories = audit_data.get('advisories', {})
-
-    for advisory_id, advisory in list(advisories.items())[:10]:  # Limit to 10
+    for advisory in advisories:
+        module_name = advisory.get('module_name')
+        title = advisory.get('title')
         packages.append({
-            "name": advisory.get('module_name'),
+            "name": module_name,
             "severity": advisory.get('severity'),
-            "via": [advisory.get('title')] if advisory.get('title') else [],
-            "fix": f"npm update {advisory.get('module_name')}"
+            "via": [title] if title else [],
+            "fix": f"npm update {module_name}"
         })
 
     return vuln_summary, packages
@@ -61,21 +235,20 @@ def run_npm_audit():
 
 def run_npm_outdated():
     """Check for outdated packages"""
-    print("→ Checking for outdated packages...", file=sys.stderr)
+    log("→ Checking for outdated packages...")
 
     result = subprocess.run(
         ['npm', 'outdated', '--json'],
-        capture_output=True,
-        text=True
+        capture_output=True
     )
 
     try:
-        outdated_data = json.loads(result.stdout) if result.stdout.strip() else {}
-    except json.JSONDecodeError:
+        outdated_data = load_json(result.stdout) if result.stdout.strip() else {}
+    except ValueError:
         return {"count": 0, "packages": []}
 
     packages = []
-    for pkg_name, pkg_info in list(outdated_data.items())[:15]:  # Limit to 15
+    for pkg_name, pkg_info in islice(outdated_data.items(), 15):  # Limit to 15
         current = pkg_info.get('current', 'unknown')
         latest = pkg_info.get('latest', 'unknown')
 
@@ -95,40 +268,38 @@ def run_npm_outdated():
     }
 
 
+@functools.lru_cache(maxsize=512)
 def determine_update_type(current, latest):
     """Determine if update is patch, minor, or major"""
-    try:
-        current_parts = [int(x) for x in current.split('.')]
-        latest_parts = [int(x) for x in latest.split('.')]
-
-        if current_parts[0] != latest_parts[0]:
-            return "major"
-        elif len(current_parts) > 1 and len(latest_parts) > 1 and current_parts[1] != latest_parts[1]:
-            return "minor"
-        else:
-            return "patch"
-    except:
+    current_match = SEMVER_PATTERN.match(current) if isinstance(current, str) else None
+    latest_match = SEMVER_PATTERN.match(latest) if isinstance(latest, str) else None
+    if not current_match or not latest_match:
         return "unknown"
 
+    current_parts = tuple(int(x or 0) for x in current_match.groups())
+    latest_parts = tuple(int(x or 0) for x in latest_match.groups())
 
-def parse_audit_text(output):
-    """Fallback text parsing for npm audit"""
-    import re
+    if current_parts[0] != latest_parts[0]:
+        return "major"
+    elif current_parts[1] != latest_parts[1]:
+        return "minor"
+    else:
+        return "patch"
 
-    # Look for summary line
-    # "found 20 vulnerabilities (3 low, 10 moderate, 5 high, 2 critical)"
-    pattern = r'found (\d+) vulnerabilit(?:y|ies)\s+\((?:(\d+) low)?[,\s]*(?:(\d+) moderate)?[,\s]*(?:(\d+) high)?[,\s]*(?:(\d+) critical)?\)'
 
-    match = re.search(pattern, output)
+def parse_audit_text(output):
+    """Fallback text parsing for npm audit"""
+    match = AUDIT_SUMMARY_PATTERN.search(output)
 
     if match:
-        return {
-            "critical": int(match.group(5)) if match.group(5) else 0,
-            "high": int(match.group(4)) if match.group(4) else 0,
-            "moderate": int(match.group(3)) if match.group(3) else 0,
-            "low": int(match.group(2)) if match.group(2) else 0,
-            "total": int(match.group(1))
-        }, []
+        # Severity counts only come from the summary's own parenthesised breakdown
+        breakdown = match.group(2) or ""
+        summary = {}
+        for severity, pattern in SEVERITY_PATTERNS.items():
+            severity_match = pattern.search(breakdown)
+            summary[severity] = int(severity_match.group(1)) if severity_match else 0
+        summary["total"] = int(match.group(1))
+        return summary, []
 
     return {
         "critical": 0,
@@ -141,12 +312,14 @@ def parse_audit_text(output):
 
 def main():
     """Main entry point"""
+    jsonl = "--jsonl" in sys.argv[1:]
+
     try:
         # Run audit
         vuln_result = run_npm_audit()
 
         if isinstance(vuln_result, dict) and vuln_result.get("status") == "error":
-            print(json.dumps(vuln_result, indent=2))
+            emit_result(vuln_result, jsonl)
             sys.exit(1)
 
         vuln_summary, packages = vuln_result
@@ -175,16 +348,16 @@ def main():
         if not can_proceed:
             result["details"] = f"{critical} critical and {high} high severity vulnerabilities must be fixed"
 
-        print(json.dumps(result, indent=2))
+        emit_result(result, jsonl)
 
-        # Print summary to stderr
+        # Queue summary for stderr
         if total > 0:
-            print(f"❌ Found {total} vulnerabilities ({critical} critical, {high} high)", file=sys.stderr)
+            log(f"❌ Found {total} vulnerabilities ({critical} critical, {high} high)")
         else:
-            print(f"✅ No vulnerabilities found", file=sys.stderr)
+            log(f"✅ No vulnerabilities found")
 
         if outdated["count"] > 0:
-            print(f"ℹ️  {outdated['count']} packages are outdated", file=sys.stderr)
+            log(f"ℹ️  {outdated['count']} packages are outdated")
 
         sys.exit(0 if can_proceed else 1)
 
@@ -194,9 +367,12 @@ def main():
             "error": str(e),
             "details": "Failed to run dependency audit"
         }
-        print(json.dumps(error_result, indent=2))
+        emit_result(error_result, jsonl)
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        flush_log()
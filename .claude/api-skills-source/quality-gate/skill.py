@@ -12,25 +12,98 @@ import subprocess
 import json
 import os
 import re
-from pathlib import Path
-from typing import Dict, List, Any
+import signal
+import sys
+import threading
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
+
+
+# TypeScript error: "src/App.tsx(42,10): error TS2339: Property 'user' does not exist"
+TS_ERROR_PATTERN = re.compile(r'(.+\.tsx?)\((\d+),(\d+)\): error (TS\d+): (.+)')
+
+# Jest format: "Tests: 5 passed, 5 total"
+TEST_SUMMARY_PATTERN = re.compile(r'Tests:\s+(\d+)\s+passed.*?(\d+)\s+total')
+
+# Jest coverage format: "Statements   : 85.5% ( 123/144 )"
+COVERAGE_PATTERNS = {
+    metric: re.compile(rf'{metric.capitalize()}\s*:\s*([\d.]+)%', re.IGNORECASE)
+    for metric in ["statements", "branches", "functions", "lines"]
+}
+
+# Child processes of in-flight checks, so fail-fast mode can stop them
+_active_processes = set()
+_active_lock = threading.Lock()
+_aborted = threading.Event()
+
+
+def first_match(pattern: re.Pattern, *texts: str) -> Optional[re.Match]:
+    """Return the first match of pattern in any of texts, searched in order."""
+    for text in texts:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+def dump_json(data: Any) -> str:
+    """Serialize data as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def dump_json_line(data: Any) -> str:
+    """Serialize data as a single line of JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def emit_jsonl(result: Dict[str, Any]) -> None:
+    """Write the result as JSON lines: a summary line, then one line per check."""
+    summary = {key: value for key, value in result.items() if key != "details"}
+    sys.stdout.write(dump_json_line({"type": "summary", **summary}) + "\n")
+    for name, check in result.get("details", {}).items():
+        sys.stdout.write(dump_json_line({"type": "check", "name": name, **check}) + "\n")
+    sys.stdout.flush()
 
 
 def run_command(cmd: List[str], cwd: str = None) -> Dict[str, Any]:
     """Run shell command and capture output."""
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True  # Own process group, so npm's children can be killed too
         )
+        with _active_lock:
+            _active_processes.add(proc)
+            if _aborted.is_set():
+                kill_process_tree(proc)
+        try:
+            stdout, stderr = proc.communicate(timeout=300)  # 5 minute timeout
+        except subprocess.TimeoutExpired:
+            kill_process_tree(proc)
+            proc.communicate()
+            raise
+        finally:
+            with _active_lock:
+                _active_processes.discard(proc)
+
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "exit_code": result.returncode
+            "success": proc.returncode == 0,
+            "stdout": stdout.decode("utf-8", "replace"),
+            "stderr": stderr.decode("utf-8", "replace"),
+            "exit_code": proc.returncode
         }
     except subprocess.TimeoutExpired:
         return {
@@ -46,6 +119,35 @@ def run_command(cmd: List[str], cwd: str = None) -> Dict[str, Any]:
         }
 
 
+def kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kill a command along with any processes it spawned."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass  # Already exited
+
+
+def kill_active_processes() -> None:
+    """Kill the child processes of all checks, including ones about to start."""
+    with _active_lock:
+        _aborted.set()
+        for proc in _active_processes:
+            kill_process_tree(proc)
+
+
+def load_package_json(project_path: str) -> Optional[Dict[str, Any]]:
+    """Read and parse package.json once, or return None if it does not exist."""
+    package_json = os.path.join(project_path, "package.json")
+    if not os.path.isfile(package_json):
+        return None
+
+    with open(package_json, "rb") as f:
+        return json.loads(f.read())
+
+
 def check_typescript(project_path: str) -> Dict[str, Any]:
     """Validate TypeScript compilation."""
     print("🔍 Checking TypeScript...")
@@ -58,8 +160,7 @@ def check_typescript(project_path: str) -> Dict[str, Any]:
     errors = []
     if not result["success"] and result["stderr"]:
         # Parse TypeScript errors
-        error_pattern = r'(.+\.tsx?)\((\d+),(\d+)\): error (TS\d+): (.+)'
-        for match in re.finditer(error_pattern, result["stderr"]):
+        for match in TS_ERROR_PATTERN.finditer(result["stderr"]):
             errors.append({
                 "file": match.group(1),
                 "line": int(match.group(2)),
@@ -76,32 +177,8 @@ def check_typescript(project_path: str) -> Dict[str, Any]:
     }
 
 
-def run_tests(project_path: str) -> Dict[str, Any]:
-    """Run test suite."""
-    print("🧪 Running tests...")
-
-    # Check if tests are configured
-    package_json = Path(project_path) / "package.json"
-    if not package_json.exists():
-        return {
-            "passed": False,
-            "error": "package.json not found",
-            "skipped": True
-        }
-
-    with open(package_json) as f:
-        pkg = json.load(f)
-
-    if "test" not in pkg.get("scripts", {}):
-        return {
-            "passed": True,
-            "warning": "No test script configured",
-            "skipped": True
-        }
-
-    result = run_command(["npm", "test", "--", "--passWithNoTests"], cwd=project_path)
-
-    # Parse test results
+def parse_test_results(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract test counts from a test run."""
     test_summary = {
         "total": 0,
         "passed": 0,
@@ -109,49 +186,25 @@ def run_tests(project_path: str) -> Dict[str, Any]:
         "skipped": 0
     }
 
-    # Try to extract test counts from output
-    output = result["stdout"] + result["stderr"]
-
     # Jest format: "Tests: 5 passed, 5 total"
-    test_match = re.search(r'Tests:\s+(\d+)\s+passed.*?(\d+)\s+total', output)
+    test_match = first_match(TEST_SUMMARY_PATTERN, result["stdout"], result["stderr"])
     if test_match:
         test_summary["passed"] = int(test_match.group(1))
         test_summary["total"] = int(test_match.group(2))
         test_summary["failed"] = test_summary["total"] - test_summary["passed"]
 
+    # Last 1000 chars on failure - only the tails are joined, not the full output
+    tail = (result["stdout"][-1000:] + result["stderr"][-1000:])[-1000:] if not result["success"] else ""
+
     return {
         "passed": result["success"],
         "summary": test_summary,
-        "output": output[-1000:] if not result["success"] else ""  # Last 1000 chars on failure
+        "output": tail
     }
 
 
-def check_coverage(project_path: str, threshold: int = 80) -> Dict[str, Any]:
-    """Check test coverage against threshold."""
-    print("📊 Checking coverage...")
-
-    # Check if coverage is configured
-    package_json = Path(project_path) / "package.json"
-    if not package_json.exists():
-        return {
-            "passed": True,
-            "warning": "package.json not found",
-            "skipped": True
-        }
-
-    with open(package_json) as f:
-        pkg = json.load(f)
-
-    if "test:coverage" not in pkg.get("scripts", {}):
-        return {
-            "passed": True,
-            "warning": "No coverage script configured",
-            "skipped": True
-        }
-
-    result = run_command(["npm", "run", "test:coverage"], cwd=project_path)
-
-    # Parse coverage from output
+def parse_coverage_results(result: Dict[str, Any], threshold: int) -> Dict[str, Any]:
+    """Extract coverage percentages from a test run and check them against threshold."""
     coverage_data = {
         "statements": 0,
         "branches": 0,
@@ -160,9 +213,8 @@ def check_coverage(project_path: str, threshold: int = 80) -> Dict[str, Any]:
     }
 
     # Jest coverage format: "Statements   : 85.5% ( 123/144 )"
-    for metric in ["statements", "branches", "functions", "lines"]:
-        pattern = rf'{metric.capitalize()}\s*:\s*([\d.]+)%'
-        match = re.search(pattern, result["stdout"], re.IGNORECASE)
+    for metric, pattern in COVERAGE_PATTERNS.items():
+        match = pattern.search(result["stdout"])
         if match:
             coverage_data[metric] = float(match.group(1))
 
@@ -177,6 +229,65 @@ def check_coverage(project_path: str, threshold: int = 80) -> Dict[str, Any]:
     }
 
 
+def run_tests(project_path: str, pkg: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run test suite."""
+    print("🧪 Running tests...")
+
+    # Check if tests are configured
+    if pkg is None:
+        return {
+            "passed": False,
+            "error": "package.json not found",
+            "skipped": True
+        }
+
+    if "test" not in pkg.get("scripts", {}):
+        return {
+            "passed": True,
+            "warning": "No test script configured",
+            "skipped": True
+        }
+
+    result = run_command(["npm", "test", "--", "--passWithNoTests"], cwd=project_path)
+    return parse_test_results(result)
+
+
+def run_tests_and_coverage(
+    project_path: str, pkg: Optional[Dict[str, Any]], threshold: int = 80
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run the test suite once and check coverage from the same run.
+
+    Uses the test:coverage script when there is one, so tests are not run a
+    second time just for coverage; otherwise runs plain npm test and skips
+    the coverage check. Coverage is also skipped when the tests fail.
+
+    Returns:
+        Tuple of (tests result, coverage result)
+    """
+    scripts = pkg.get("scripts", {}) if pkg is not None else {}
+
+    if "test:coverage" not in scripts:
+        coverage = {
+            "passed": True,
+            "warning": "package.json not found" if pkg is None else "No coverage script configured",
+            "skipped": True
+        }
+        return run_tests(project_path, pkg), coverage
+
+    print("🧪 Running tests with coverage...")
+
+    result = run_command(["npm", "run", "test:coverage", "--", "--passWithNoTests"], cwd=project_path)
+    tests = parse_test_results(result)
+
+    # Coverage numbers from a failing run are meaningless - don't gate on them
+    if not tests["passed"]:
+        coverage = {"passed": True, "skipped": True, "warning": "Tests failed; skipping coverage"}
+        return tests, coverage
+
+    return tests, parse_coverage_results(result, threshold)
+
+
 def run_build(project_path: str) -> Dict[str, Any]:
     """Try building the project."""
     print("🏗️  Running build...")
@@ -189,22 +300,18 @@ def run_build(project_path: str) -> Dict[str, Any]:
     }
 
 
-def run_lint(project_path: str) -> Dict[str, Any]:
+def run_lint(project_path: str, pkg: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     """Run linter."""
     print("🧹 Running linter...")
 
     # Check if lint script exists
-    package_json = Path(project_path) / "package.json"
-    if not package_json.exists():
+    if pkg is None:
         return {
             "passed": True,
             "warning": "package.json not found",
             "skipped": True
         }
 
-    with open(package_json) as f:
-        pkg = json.load(f)
-
     if "lint" not in pkg.get("scripts", {}):
         return {
             "passed": True,
@@ -220,13 +327,14 @@ def run_lint(project_path: str) -> Dict[str, Any]:
     }
 
 
-def quality_gate(project_path: str = ".", coverage_threshold: int = 80) -> Dict[str, Any]:
+def quality_gate(project_path: str = ".", coverage_threshold: int = 80, fail_fast: bool = False) -> Dict[str, Any]:
     """
     Run comprehensive quality gate checks.
 
     Args:
         project_path: Path to project directory (default: current directory)
         coverage_threshold: Minimum coverage percentage (default: 80)
+        fail_fast: Stop the remaining checks as soon as one fails (default: False)
 
     Returns:
         Dictionary with results of all quality checks
@@ -243,14 +351,64 @@ def quality_gate(project_path: str = ".", coverage_threshold: int = 80) -> Dict[
             "error": f"Project path not found: {project_path}"
         }
 
-    # Run all checks
-    results = {
-        "typescript": check_typescript(project_path),
-        "tests": run_tests(project_path),
-        "coverage": check_coverage(project_path, coverage_threshold),
-        "build": run_build(project_path),
-        "lint": run_lint(project_path)
-    }
+    # Parse package.json once and share it with every check
+    pkg = load_package_json(project_path)
+    _aborted.clear()
+
+    # Run all checks concurrently - each one is bound by its npm/npx child process
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Tests and coverage share one test run, so that job reports two checks
+        futures = {
+            executor.submit(check_typescript, project_path): ("typescript",),
+            executor.submit(run_tests_and_coverage, project_path, pkg, coverage_threshold): ("tests", "coverage"),
+            executor.submit(run_build, project_path): ("build",),
+            executor.submit(run_lint, project_path, pkg): ("lint",)
+        }
+        results = {}
+
+        def collect(future):
+            names = futures[future]
+            outcome = future.result()
+            check_results = dict(zip(names, outcome if len(names) > 1 else (outcome,)))
+            results.update(check_results)
+            return check_results
+
+        # Futures that had finished on their own before fail-fast killed the rest
+        finished = set()
+
+        for future in as_completed(futures):
+            check_results = collect(future)
+
+            failed = any(not r.get("passed") and not r.get("skipped") for r in check_results.values())
+            if fail_fast and failed:
+                for pending in futures:
+                    pending.cancel()
+                finished = {pending for pending in futures if pending.done() and not pending.cancelled()}
+                kill_active_processes()
+                break
+
+        # Keep checks that had already finished when fail-fast kicked in - any
+        # check finishing after that point was killed and counts as stopped
+        for future, names in futures.items():
+            if names[0] in results or future.cancelled():
+                continue
+            if future in finished and future.exception() is None:
+                collect(future)
+            else:
+                future.exception()  # Wait for killed checks to wind down
+
+        # Checks stopped by fail-fast are reported as skipped, not as failures
+        for names in futures.values():
+            for name in names:
+                if name not in results:
+                    results[name] = {
+                        "passed": False,
+                        "skipped": True,
+                        "warning": "Not run - stopped after an earlier check failed"
+                    }
+
+        # Keep the details in the fixed check order
+        results = {name: results[name] for names in futures.values() for name in names}
 
     # Determine overall pass/fail
     all_passed = all(
@@ -297,15 +455,23 @@ def quality_gate(project_path: str = ".", coverage_threshold: int = 80) -> Dict[
 
 # Entry point for Claude Code Execution
 if __name__ == "__main__":
-    import sys
-
     # Parse command line arguments
-    project_path = sys.argv[1] if len(sys.argv) > 1 else "."
-    coverage_threshold = int(sys.argv[2]) if len(sys.argv) > 2 else 80
-
-    # Run quality gate
-    result = quality_gate(project_path, coverage_threshold)
-
-    # Output JSON result
-    print("\n📤 Result JSON:")
-    print(json.dumps(result, indent=2))
+    flags = {"--fail-fast", "--jsonl"}
+    fail_fast = "--fail-fast" in sys.argv[1:]
+    jsonl = "--jsonl" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+    project_path = args[0] if len(args) > 0 else "."
+    coverage_threshold = int(args[1]) if len(args) > 1 else 80
+
+    if jsonl:
+        # Keep stdout for JSON lines only - progress goes to stderr
+        with redirect_stdout(sys.stderr):
+            result = quality_gate(project_path, coverage_threshold, fail_fast)
+        emit_jsonl(result)
+    else:
+        # Run quality gate
+        result = quality_gate(project_path, coverage_threshold, fail_fast)
+
+        # Output JSON result
+        print("\n📤 Result JSON:")
+        print(dump_json(result))
@@ -4,11 +4,93 @@ Run Comprehensive Tests - Execute test suite and return structured results
 """
 
 import subprocess
+import io
 import re
 import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
+
+
+# Report at most this many failures, looking this many lines past each FAIL header
+MAX_FAILURES = 10
+FAILURE_CONTEXT_LINES = 10
+
+# Failure header, error message and stack trace line patterns in one alternation:
+#   FAIL  src/components/Test.test.tsx > Test Suite > test name
+#   AssertionError: expected 1 to be 2
+#   at src/components/Test.test.tsx:42:10
+FAILURE_SCAN_PATTERN = re.compile(
+    r'(?P<fail>FAIL[ \t]+(?P<fail_file>\S+)[ \t]+>[ \t]+(?P<fail_suite>[^>\n]+)[ \t]+>[ \t]+(?P<fail_test>.+))'
+    r'|(?P<error>(?:(?:AssertionError|TypeError|ReferenceError|Error):|Expected|Received) (?P<error_message>.+))'
+    r'|(?P<line>at .+?:(?P<line_number>\d+):\d+)'
+)
+
+# Vitest summary lines:
+#   "Tests  45 passed (45)"
+#   "Test Files  2 passed | 1 failed (3 total)"
+TEST_COUNT_PATTERN = re.compile(r'Tests?\s+(\d+)\s+passed(?:\s+\|\s+(\d+)\s+failed)?\s+\((\d+)')
+COVERAGE_PATTERN = re.compile(r'All files\s+\|\s+(\d+\.?\d*)')
+DURATION_PATTERN = re.compile(r'Duration\s+(\d+\.?\d*\w+)')
+
+
+# Status messages are collected here and written to stderr in one go on exit
+_log_buffer = io.StringIO()
+
+
+def log(message=""):
+    """Queue a status message for stderr"""
+    _log_buffer.write(message + "\n")
+
+
+def flush_log():
+    """Write all queued status messages to stderr"""
+    sys.stderr.write(_log_buffer.getvalue())
+    sys.stderr.flush()
+
+
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def dump_json_line(data):
+    """Serialize data as a single line of JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def emit_result(result, jsonl=False):
+    """Print the result as indented JSON, or as JSON lines with --jsonl
+
+    JSON lines mode writes a summary line followed by one line per failure.
+    """
+    if not jsonl:
+        print(dump_json(result))
+        return
+
+    summary = {key: value for key, value in result.items() if key != "failures"}
+    sys.stdout.write(dump_json_line({"type": "summary", **summary}) + "\n")
+    for failure in result.get("failures", []):
+        sys.stdout.write(dump_json_line({"type": "failure", **failure}) + "\n")
+    sys.stdout.flush()
+
+
+def first_match(pattern, *texts):
+    """Return the first match of pattern in any of texts, searched in order"""
+    for text in texts:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
 
 def run_tests():
     """Run test suite with coverage"""
@@ -28,24 +110,27 @@ def run_tests():
             "details": "Run npm install first"
         }
 
-    print("→ Running comprehensive test suite...", file=sys.stderr)
+    log("→ Running comprehensive test suite...")
 
     # Run tests
     result = subprocess.run(
         ['npm', 'run', 'test'],
         capture_output=True,
-        text=True,
         timeout=300  # 5 minute timeout
     )
 
-    output = result.stdout + result.stderr
+    stdout = result.stdout.decode('utf-8', 'replace')
+    stderr = result.stderr.decode('utf-8', 'replace')
 
     # Parse test results
-    return parse_test_results(output, result.returncode)
+    return parse_test_results(stdout, stderr, result.returncode)
+
 
+def parse_test_results(stdout, stderr, exit_code):
+    """Parse test output for results
 
-def parse_test_results(output, exit_code):
-    """Parse test output for results"""
+    stdout and stderr are scanned separately rather than concatenated.
+    """
     summary = {
         "total": 0,
         "passed": 0,
@@ -62,8 +147,7 @@ def parse_test_results(output, exit_code):
     # "Test Files  2 passed | 1 failed (3 total)"
 
     # Extract test counts
-    test_pattern = r'Tests?\s+(\d+)\s+passed(?:\s+\|\s+(\d+)\s+failed)?\s+\((\d+)'
-    test_match = re.search(test_pattern, output)
+    test_match = first_match(TEST_COUNT_PATTERN, stdout, stderr)
 
     if test_match:
         passed = int(test_match.group(1))
@@ -75,30 +159,28 @@ def parse_test_results(output, exit_code):
         summary["total"] = total
 
     # Extract coverage
-    coverage_pattern = r'All files\s+\|\s+(\d+\.?\d*)'
-    coverage_match = re.search(coverage_pattern, output)
+    coverage_match = first_match(COVERAGE_PATTERN, stdout, stderr)
     if coverage_match:
         summary["coverage"] = float(coverage_match.group(1))
 
     # Extract duration
-    duration_pattern = r'Duration\s+(\d+\.?\d*\w+)'
-    duration_match = re.search(duration_pattern, output)
+    duration_match = first_match(DURATION_PATTERN, stdout, stderr)
     if duration_match:
         summary["duration"] = duration_match.group(1)
 
     # Parse failures if any
     if summary["failed"] > 0:
-        failures = parse_failures(output)
+        failures = (parse_failures(stdout) + parse_failures(stderr))[:MAX_FAILURES]
 
     # Determine status
     if exit_code == 0 and summary["failed"] == 0:
         status = "pass"
         can_proceed = True
-        print(f"✅ All tests passed ({summary['passed']}/{summary['total']})", file=sys.stderr)
+        log(f"✅ All tests passed ({summary['passed']}/{summary['total']})")
     else:
         status = "fail"
         can_proceed = False
-        print(f"❌ Tests failed ({summary['failed']} failed, {summary['passed']} passed)", file=sys.stderr)
+        log(f"❌ Tests failed ({summary['failed']} failed, {summary['passed']} passed)")
 
     result = {
         "status": status,
@@ -113,75 +195,66 @@ def parse_test_results(output, exit_code):
     return result
 
 
+def find_context_end(output, start):
+    """Return the offset just past the last line of detail after a FAIL header"""
+    end = start
+    for _ in range(FAILURE_CONTEXT_LINES + 1):
+        end = output.find('\n', end)
+        if end == -1:
+            return len(output)
+        end += 1
+    return end
+
+
 def parse_failures(output):
     """Extract failure details from test output"""
     failures = []
+    current = None
+    window_end = 0
 
-    # Look for failure patterns in Vitest output
-    # Pattern: FAIL  src/components/Test.test.tsx > Test Suite > test name
-    failure_pattern = r'FAIL\s+([^\s]+)\s+>\s+([^>]+)\s+>\s+(.+)'
+    # Single pass over the output - FAIL headers open a new failure, error
+    # messages and stack trace line numbers that follow are attached to it
+    for match in FAILURE_SCAN_PATTERN.finditer(output):
+        kind = match.lastgroup
 
-    # Error patterns to extract from subsequent lines
-    error_patterns = [
-        r'AssertionError: (.+)',
-        r'Error: (.+)',
-        r'Expected (.+)',
-        r'Received (.+)',
-        r'TypeError: (.+)',
-        r'ReferenceError: (.+)'
-    ]
+        if kind == "fail":
+            if current:
+                failures.append(current)
+                # Limit to first 10 failures for clarity
+                if len(failures) == MAX_FAILURES:
+                    return failures
 
-    # Line number pattern in stack traces
-    line_pattern = r'at .+?:(\d+):\d+'
+            current = {
+                "file": match.group("fail_file").strip(),
+                "test": f"{match.group('fail_suite').strip()} > {match.group('fail_test').strip()}",
+                "error": "Test failed",
+                "line": 0
+            }
+            window_end = find_context_end(output, match.end())
+            continue
 
-    lines = output.split('\n')
+        # Only look ahead in the next 10 lines for error details
+        if not current or match.start() >= window_end:
+            continue
 
-    for i, line in enumerate(lines):
-        match = re.search(failure_pattern, line)
-        if match:
-            file_path = match.group(1).strip()
-            suite = match.group(2).strip()
-            test_name = match.group(3).strip()
-
-            # Look ahead in next 10 lines for error details
-            error_msg = "Test failed"
-            line_number = 0
-
-            for j in range(i + 1, min(i + 11, len(lines))):
-                next_line = lines[j]
-
-                # Try to extract error message
-                for error_pat in error_patterns:
-                    err_match = re.search(error_pat, next_line)
-                    if err_match:
-                        error_msg = err_match.group(1).strip()
-                        break
+        if kind == "error" and current["error"] == "Test failed":
+            current["error"] = match.group("error_message").strip()
+        elif kind == "line" and current["line"] == 0:
+            current["line"] = int(match.group("line_number"))
 
-                # Try to extract line number from stack trace
-                line_match = re.search(line_pattern, next_line)
-                if line_match:
-                    line_number = int(line_match.group(1))
+    if current:
+        failures.append(current)
 
-                # Stop if we found both or hit another FAIL
-                if (error_msg != "Test failed" and line_number > 0) or 'FAIL' in next_line:
-                    break
-
-            failures.append({
-                "file": file_path,
-                "test": f"{suite} > {test_name}",
-                "error": error_msg,
-                "line": line_number
-            })
-
-    # Limit to first 10 failures for clarity
-    return failures[:10]
+    return failures
 
 
 def main():
     """Main entry point"""
+    jsonl = "--jsonl" in sys.argv[1:]
+
     try:
         result = run_tests()
-        print(json.dumps(result, indent=2))
+        emit_result(result, jsonl)
 
         # Exit with appropriate code
         sys.exit(0 if result.get("status") == "pass" else 1)
@@ -192,7 +265,7 @@ def main():
             "error": "Test execution timed out",
             "details": "Tests took longer than 5 minutes"
         }
-        print(json.dumps(error_result, indent=2))
+        emit_result(error_result, jsonl)
         sys.exit(1)
 
     except Exception as e:
@@ -201,9 +274,12 @@ def main():
             "error": str(e),
             "details": "Failed to run tests"
         }
-        print(json.dumps(error_result, indent=2))
+        emit_result(error_result, jsonl)
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        flush_log()
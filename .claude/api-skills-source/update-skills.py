@@ -10,10 +10,29 @@ of skill names to their IDs.
 """
 
 import os
+import sys
 import json
+import hashlib
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import re
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # Optional - fall back to requests
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:  # Optional - fall back to reading each file into memory
+    MultipartEncoder = None
 
 
 # Map skill directory names to their Skill IDs
@@ -30,6 +49,40 @@ SKILL_IDS = {
     "audit-dependencies": "skill_01JvZxokSnKZ7bLwLQMAvKo1"
 }
 
+# Concurrent API requests (also the size of the session's connection pool)
+MAX_WORKERS = 8
+
+# Content hash and version of each skill as of its last successful update
+CACHE_PATH = Path(__file__).parent.parent / ".skills-cache.json"
+
+
+def create_session(api_key: str) -> "httpx.Client | requests.Session":
+    """Create a keep-alive client carrying the Skills API headers
+
+    Prefers httpx, which multiplexes all requests over a single HTTP/2
+    connection when h2 is installed (pip install 'httpx[http2]'), and
+    falls back to a pooled requests session otherwise.
+    """
+    headers = {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "anthropic-beta": "skills-2025-10-02"
+    }
+
+    if httpx is not None:
+        return httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            headers=headers,
+            timeout=60,
+            limits=httpx.Limits(max_connections=MAX_WORKERS)
+        )
+
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    return session
+
 
 def get_skill_display_title(skill_dir: Path) -> str:
     """Extract display title from SKILL.md frontmatter"""
@@ -38,25 +91,123 @@ def get_skill_display_title(skill_dir: Path) -> str:
         return skill_dir.name
 
     with open(skill_md) as f:
-        content = f.read()
-        frontmatter_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-        if frontmatter_match:
-            yaml_content = frontmatter_match.group(1)
-            for line in yaml_content.split('\n'):
+        # Only read as far as the end of the frontmatter
+        if f.readline().strip() == '---':
+            for line in f:
+                if line.strip() == '---':
+                    break
                 if line.startswith('name:'):
                     return line.split(':', 1)[1].strip()
 
     return skill_dir.name
 
 
-def update_skill_version(skill_dir: Path, skill_id: str, api_key: str) -> dict:
+# Directories that are never part of a skill upload
+SKIP_DIRS = {'__pycache__', '.git'}
+
+
+def walk_files(root: str):
+    """Yield every file below root, skipping SKIP_DIRS
+
+    Uses os.scandir so file/directory checks come from the directory
+    listing itself instead of a separate stat() per entry.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield Path(entry.path)
+
+
+def collect_skill_files(skill_dir: Path) -> list:
+    """Collect (file_path, rel_path) pairs for every file in a skill directory"""
+    files_to_upload = []
+    for file_path in walk_files(skill_dir):
+        # Calculate relative path from skill_dir parent
+        rel_path = file_path.relative_to(skill_dir.parent)
+        files_to_upload.append((file_path, rel_path))
+    return files_to_upload
+
+
+def skill_hash(skill_dir: Path) -> str:
+    """Hash the paths and contents of all files that would be uploaded"""
+    h = hashlib.blake2b(digest_size=16)
+    for file_path, rel_path in sorted(collect_skill_files(skill_dir), key=lambda f: str(f[1])):
+        h.update(str(rel_path).encode())
+        h.update(b'\0')
+        h.update(file_path.read_bytes())
+    return h.hexdigest()
+
+
+def load_cache() -> dict:
+    """Load the skills cache, or an empty one if missing or unreadable"""
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict):
+    """Write the skills cache back to disk"""
+    CACHE_PATH.write_text(json.dumps(cache, indent=2))
+
+
+class LazyFile:
+    """Readable that opens its file on first read and closes it at EOF
+
+    Lets multipart uploads stream any number of files while holding at most
+    one file descriptor open at a time.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.size = path.stat().st_size
+        self.remaining = self.size
+        self.handle = None
+
+    def __len__(self):
+        return self.remaining
+
+    def tell(self) -> int:
+        return self.size - self.remaining
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self.tell()
+        elif whence == os.SEEK_END:
+            offset += self.size
+        if self.handle is not None:
+            self.handle.seek(offset)
+        self.remaining = max(self.size - offset, 0)
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        if not self.remaining:
+            return b''
+        if self.handle is None:
+            self.handle = open(self.path, 'rb')
+        chunk = self.handle.read(size)
+        self.remaining = 0 if not chunk else self.remaining - len(chunk)
+        if not self.remaining:
+            self.close()
+        return chunk
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+def update_skill_version(skill_dir: Path, skill_id: str, session: "httpx.Client | requests.Session") -> dict:
     """
     Create a new version of an existing skill.
 
     Args:
         skill_dir: Path to skill directory containing SKILL.md and other files
         skill_id: Existing skill ID (e.g., skill_01TYxAPLSwWUAJvpiBgaDcfn)
-        api_key: Anthropic API key
+        session: Client created by create_session()
 
     Returns:
         API response with new version info
@@ -70,88 +221,80 @@ def update_skill_version(skill_dir: Path, skill_id: str, api_key: str) -> dict:
 
     # Prepare API request for version creation
     url = f"https://api.anthropic.com/v1/skills/{skill_id}/versions"
-    headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02"
-    }
 
     # Collect all files in skill directory
-    files_to_upload = []
-    for file_path in skill_dir.rglob('*'):
-        if file_path.is_file() and file_path.name != '__pycache__':
-            # Calculate relative path from skill_dir parent
-            rel_path = file_path.relative_to(skill_dir.parent)
-            files_to_upload.append((file_path, rel_path))
-
-    print(f"\n📤 Updating skill: {display_title}")
-    print(f"   Skill ID: {skill_id}")
-    print(f"   Folder: {skill_dir.name}")
-    print(f"   Files: {len(files_to_upload)}")
-
-    # Prepare multipart form data
+    files_to_upload = collect_skill_files(skill_dir)
+
+    # Prepare multipart form data - files are opened one at a time as they are sent
     files = []
-    file_handles = []
+    lazy_files = []
 
     try:
-        # Open all files
         for file_path, rel_path in files_to_upload:
             try:
-                file_handle = open(file_path, 'rb')
-                file_handles.append(file_handle)
-                files.append(
-                    ('files[]', (str(rel_path), file_handle, 'application/octet-stream'))
-                )
-            except IOError as e:
-                for fh in file_handles:
-                    fh.close()
+                lazy_file = LazyFile(file_path)
+            except OSError as e:
                 raise IOError(f"Failed to read file {file_path}: {e}")
+            lazy_files.append(lazy_file)
+            files.append(
+                ('files[]', (str(rel_path), lazy_file, 'application/octet-stream'))
+            )
 
         data = {
             'display_title': display_title
         }
 
         # POST to versions endpoint to create new version
-        response = requests.post(url, headers=headers, data=data, files=files)
+        if isinstance(session, requests.Session) and MultipartEncoder is not None:
+            # requests buffers the whole body itself, so stream it through the encoder
+            body = MultipartEncoder(fields=list(data.items()) + files)
+            response = session.post(url, data=body, headers={'Content-Type': body.content_type})
+        else:
+            response = session.post(url, data=data, files=files)
 
         if response.status_code in [200, 201]:
-            result = response.json()
-            print(f"✅ New version created!")
-            print(f"   Version ID: {result.get('id')}")
-            print(f"   Version Number: {result.get('version')}")
-            return result
+            return response.json()
         else:
-            print(f"❌ Update failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            raise Exception(f"Failed to update skill: {response.text}")
+            raise Exception(f"Failed to update skill ({response.status_code}): {response.text}")
 
     finally:
-        # Always close file handles
-        for file_handle in file_handles:
-            try:
-                file_handle.close()
-            except:
-                pass
+        # Close any file left open by an interrupted upload
+        for lazy_file in lazy_files:
+            lazy_file.close()
 
 
-def get_skill_info(skill_id: str, api_key: str) -> dict:
-    """Get current skill information"""
-    url = f"https://api.anthropic.com/v1/skills/{skill_id}"
-    headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02"
-    }
+def get_latest_versions(session: "httpx.Client | requests.Session") -> dict:
+    """Get the latest version of every custom skill, keyed by skill ID
 
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise Exception(f"Failed to get skill info: {response.text}")
+    Uses the list endpoint so all versions come back in one request
+    (plus one per extra page) instead of one request per skill.
+    """
+    url = "https://api.anthropic.com/v1/skills"
+    params = {"source": "custom", "limit": 100}
+    versions = {}
+
+    while True:
+        response = session.get(url, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to list skills: {response.text}")
+
+        page = response.json()
+        for skill in page.get("data", []):
+            versions[skill.get("id")] = skill.get("latest_version")
+
+        if not page.get("has_more") or not page.get("next_page"):
+            return versions
+        params["page"] = page["next_page"]
 
 
 def main():
-    """Update all skills with new versions."""
+    """Update all skills with new versions.
+
+    Skills whose files are unchanged since their last successful update
+    (per CACHE_PATH) are skipped; pass --force to update them anyway.
+    """
+    force = "--force" in sys.argv[1:]
+
     api_key = os.getenv("ANTHROPIC_SKILLS_API_KEY")
     if not api_key:
         print("❌ Error: ANTHROPIC_SKILLS_API_KEY environment variable not set")
@@ -182,33 +325,75 @@ def main():
         skill_id = SKILL_IDS[skill_dir.name]
         print(f"   - {skill_dir.name} ({skill_id})")
 
+    # Skip skills whose content matches the last successful update
+    cache = load_cache()
+    hashes = {skill_dir.name: skill_hash(skill_dir) for skill_dir in skill_dirs}
+    unchanged = [
+        skill_dir for skill_dir in skill_dirs
+        if not force and cache.get(SKILL_IDS[skill_dir.name], {}).get("hash") == hashes[skill_dir.name]
+    ]
+    skill_dirs = [skill_dir for skill_dir in skill_dirs if skill_dir not in unchanged]
+
+    if unchanged:
+        print("\n⏭️  Unchanged since last update (use --force to update anyway):")
+        for skill_dir in unchanged:
+            print(f"   - {skill_dir.name}: v{cache[SKILL_IDS[skill_dir.name]].get('version')}")
+
+    if not skill_dirs:
+        print("\n✅ All skills are up to date")
+        return 0
+
+    session = create_session(api_key)
+
     # Show current versions
     print("\n📋 Current versions:")
-    for skill_dir in skill_dirs:
-        skill_id = SKILL_IDS[skill_dir.name]
-        try:
-            info = get_skill_info(skill_id, api_key)
-            print(f"   - {skill_dir.name}: v{info.get('latest_version')}")
-        except Exception as e:
-            print(f"   - {skill_dir.name}: Error fetching version")
-
-    # Update each skill
+    try:
+        versions = get_latest_versions(session)
+        for skill_dir in skill_dirs:
+            print(f"   - {skill_dir.name}: v{versions.get(SKILL_IDS[skill_dir.name], '?')}")
+    except Exception as e:
+        print(f"   ⚠️  Error fetching versions: {e}")
+
+    # Update all skills concurrently - progress is printed here, one block per
+    # skill, so output from concurrent updates does not interleave
     updated_skills = []
     failed_skills = []
 
-    for skill_dir in skill_dirs:
-        skill_id = SKILL_IDS[skill_dir.name]
-        try:
-            result = update_skill_version(skill_dir, skill_id, api_key)
-            updated_skills.append({
-                "name": skill_dir.name,
-                "skill_id": skill_id,
-                "version": result.get("version"),
-                "version_id": result.get("id")
-            })
-        except Exception as e:
-            print(f"❌ Failed to update {skill_dir.name}: {e}")
-            failed_skills.append(skill_dir.name)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(update_skill_version, skill_dir, SKILL_IDS[skill_dir.name], session): skill_dir
+            for skill_dir in skill_dirs
+        }
+        for future in as_completed(futures):
+            skill_dir = futures[future]
+            skill_id = SKILL_IDS[skill_dir.name]
+            try:
+                result = future.result()
+                print("\n".join([
+                    f"\n✅ {skill_dir.name}: new version created",
+                    f"   Skill ID: {skill_id}",
+                    f"   Version ID: {result.get('id')}",
+                    f"   Version Number: {result.get('version')}"
+                ]))
+                updated_skills.append({
+                    "name": skill_dir.name,
+                    "skill_id": skill_id,
+                    "version": result.get("version"),
+                    "version_id": result.get("id")
+                })
+                cache[skill_id] = {
+                    "hash": hashes[skill_dir.name],
+                    "version": result.get("version"),
+                    "version_id": result.get("id")
+                }
+            except Exception as e:
+                print(f"\n❌ {skill_dir.name}: update failed\n   Error: {e}")
+                failed_skills.append(skill_dir.name)
+
+    session.close()
+
+    if updated_skills:
+        save_cache(cache)
 
     # Summary
     print("\n" + "="*60)
@@ -7,18 +7,64 @@ Requires ANTHROPIC_API_KEY environment variable.
 """
 
 import os
+import sys
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:  # Optional - fall back to reading each file into memory
+    MultipartEncoder = None
 
-def upload_skill(skill_dir: Path, api_key: str) -> dict:
+
+# Concurrent uploads (also the size of the session's connection pool)
+MAX_WORKERS = 8
+
+
+def create_session(api_key: str) -> requests.Session:
+    """Create a keep-alive session carrying the Skills API headers"""
+    session = requests.Session()
+    session.headers.update({
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "anthropic-beta": "skills-2025-10-02"
+    })
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=retries)
+    session.mount("https://", adapter)
+    return session
+
+
+# Directories that are never part of a skill upload
+SKIP_DIRS = {'__pycache__', '.git'}
+
+
+def walk_files(root: str):
+    """Yield every file below root, skipping SKIP_DIRS
+
+    Uses os.scandir so whole skipped subtrees are never listed, and
+    file/directory checks come from the directory listing itself.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield Path(entry.path)
+
+
+def upload_skill(skill_dir: Path, session: requests.Session) -> dict:
     """
     Upload a single skill to Anthropic Skills API.
 
     Args:
         skill_dir: Path to skill directory containing SKILL.md and other files
-        api_key: Anthropic API key
+        session: Session created by create_session()
 
     Returns:
         API response with skill_id
@@ -29,38 +75,26 @@ def upload_skill(skill_dir: Path, api_key: str) -> dict:
         raise FileNotFoundError(f"SKILL.md not found in {skill_dir}")
 
     # Load skill metadata from SKILL.md frontmatter
+    display_title = skill_dir.name
     with open(skill_md) as f:
-        content = f.read()
-        # Parse YAML frontmatter for display title
-        import re
-        frontmatter_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-        display_title = skill_dir.name
-        if frontmatter_match:
-            yaml_content = frontmatter_match.group(1)
-            for line in yaml_content.split('\n'):
+        # Only read as far as the end of the frontmatter
+        if f.readline().strip() == '---':
+            for line in f:
+                if line.strip() == '---':
+                    break
                 if line.startswith('name:'):
                     display_title = line.split(':', 1)[1].strip()
                     break
 
     # Prepare API request
     url = "https://api.anthropic.com/v1/skills"
-    headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02"
-    }
 
     # Collect all files in skill directory
     files_to_upload = []
-    for file_path in skill_dir.rglob('*'):
-        if file_path.is_file() and file_path.name != '__pycache__':
-            # Calculate relative path from skill_dir
-            rel_path = file_path.relative_to(skill_dir.parent)
-            files_to_upload.append((file_path, rel_path))
-
-    print(f"\n📤 Uploading skill: {display_title}")
-    print(f"   Folder: {skill_dir.name}")
-    print(f"   Files: {len(files_to_upload)}")
+    for file_path in walk_files(skill_dir):
+        # Calculate relative path from skill_dir parent
+        rel_path = file_path.relative_to(skill_dir.parent)
+        files_to_upload.append((file_path, rel_path))
 
     # Prepare multipart form data with proper error handling
     files = []
@@ -86,18 +120,17 @@ def upload_skill(skill_dir: Path, api_key: str) -> dict:
         }
 
         # Upload to API
-        response = requests.post(url, headers=headers, data=data, files=files)
+        if MultipartEncoder is not None:
+            # requests buffers the whole body itself, so stream it through the encoder
+            body = MultipartEncoder(fields=list(data.items()) + files)
+            response = session.post(url, data=body, headers={'Content-Type': body.content_type})
+        else:
+            response = session.post(url, data=data, files=files)
 
         if response.status_code in [200, 201]:
-            result = response.json()
-            print(f"✅ Successfully uploaded!")
-            print(f"   Skill ID: {result.get('id')}")
-            print(f"   Version: {result.get('latest_version')}")
-            return result
+            return response.json()
         else:
-            print(f"❌ Upload failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            raise Exception(f"Failed to upload skill: {response.text}")
+            raise Exception(f"Failed to upload skill ({response.status_code}): {response.text}")
 
     finally:
         # Always close file handles, even on error
@@ -108,16 +141,14 @@ def upload_skill(skill_dir: Path, api_key: str) -> dict:
                 pass  # Ignore errors during cleanup
 
 
-def list_skills(api_key: str) -> list:
+def list_skills(session: requests.Session) -> list:
     """List all available skills."""
     url = "https://api.anthropic.com/v1/skills"
     headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
         "anthropic-beta": "code-execution-2025-08-25,skills-2025-10-02"
     }
 
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
 
     if response.status_code == 200:
         return response.json().get("skills", [])
@@ -126,7 +157,13 @@ def list_skills(api_key: str) -> list:
 
 
 def main():
-    """Upload all skills in api-skills-source directory."""
+    """Upload all skills in api-skills-source directory.
+
+    Lists your custom skills afterwards unless --no-list is passed or
+    every upload failed.
+    """
+    list_after_upload = "--no-list" not in sys.argv[1:]
+
     # Check for API key (use custom var to avoid conflict with Claude Code)
     api_key = os.getenv("ANTHROPIC_SKILLS_API_KEY")
     if not api_key:
@@ -164,54 +201,75 @@ def main():
     for skill_dir in skill_dirs:
         print(f"   - {skill_dir.name}")
 
-    # Upload each skill
+    session = create_session(api_key)
+
+    # Upload all skills concurrently - progress is printed here, one block per
+    # skill, so output from concurrent uploads does not interleave
     uploaded_skills = []
     failed_skills = []
 
-    for skill_dir in skill_dirs:
-        try:
-            result = upload_skill(skill_dir, api_key)
-            uploaded_skills.append({
-                "name": skill_dir.name,
-                "skill_id": result.get("id"),
-                "version": result.get("version")
-            })
-        except Exception as e:
-            print(f"❌ Failed to upload {skill_dir.name}: {e}")
-            failed_skills.append(skill_dir.name)
-
-    # Summary
-    print("\n" + "="*60)
-    print("📊 Upload Summary")
-    print("="*60)
-    print(f"✅ Uploaded: {len(uploaded_skills)}")
-    print(f"❌ Failed: {len(failed_skills)}")
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(skill_dirs))) as executor:
+        futures = {
+            executor.submit(upload_skill, skill_dir, session): skill_dir
+            for skill_dir in skill_dirs
+        }
+        for future in as_completed(futures):
+            skill_dir = futures[future]
+            try:
+                result = future.result()
+                print("\n".join([
+                    f"\n✅ {skill_dir.name}: uploaded",
+                    f"   Skill ID: {result.get('id')}",
+                    f"   Version: {result.get('latest_version')}"
+                ]))
+                uploaded_skills.append({
+                    "name": skill_dir.name,
+                    "skill_id": result.get("id"),
+                    "version": result.get("version")
+                })
+            except Exception as e:
+                print(f"\n❌ {skill_dir.name}: upload failed\n   Error: {e}")
+                failed_skills.append(skill_dir.name)
+
+    # Summary - built up front and written in one go
+    summary = [
+        "\n" + "="*60,
+        "📊 Upload Summary",
+        "="*60,
+        f"✅ Uploaded: {len(uploaded_skills)}",
+        f"❌ Failed: {len(failed_skills)}"
+    ]
 
     if uploaded_skills:
-        print("\n✅ Successfully uploaded skills:")
+        summary.append("\n✅ Successfully uploaded skills:")
         for skill in uploaded_skills:
-            print(f"   - {skill['name']}")
-            print(f"     ID: {skill['skill_id']}")
-            print(f"     Version: {skill['version']}")
+            summary.append(f"   - {skill['name']}")
+            summary.append(f"     ID: {skill['skill_id']}")
+            summary.append(f"     Version: {skill['version']}")
 
     if failed_skills:
-        print("\n❌ Failed to upload:")
+        summary.append("\n❌ Failed to upload:")
         for name in failed_skills:
-            print(f"   - {name}")
+            summary.append(f"   - {name}")
 
-    # List all skills
-    print("\n📋 Listing all your custom skills:")
-    try:
-        all_skills = list_skills(api_key)
-        custom_skills = [s for s in all_skills if s.get("source") == "custom"]
+    print("\n".join(summary))
 
-        if custom_skills:
-            for skill in custom_skills:
-                print(f"   - {skill.get('name')} (ID: {skill.get('id')})")
-        else:
-            print("   No custom skills found")
-    except Exception as e:
-        print(f"   ⚠️  Could not list skills: {e}")
+    # List all skills - nothing new to show if every upload failed
+    if list_after_upload and uploaded_skills:
+        print("\n📋 Listing all your custom skills:")
+        try:
+            all_skills = list_skills(session)
+            custom_skills = [s for s in all_skills if s.get("source") == "custom"]
+
+            if custom_skills:
+                for skill in custom_skills:
+                    print(f"   - {skill.get('name')} (ID: {skill.get('id')})")
+            else:
+                print("   No custom skills found")
+        except Exception as e:
+            print(f"   ⚠️  Could not list skills: {e}")
+
+    session.close()
 
     print("="*60)
 
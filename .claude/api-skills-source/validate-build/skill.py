@@ -4,29 +4,69 @@ Validate Build - Run production build and return structured results
 """
 
 import subprocess
+import functools
 import re
 import json
 import sys
 import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
+
+
+# Very large build logs are only scanned at the head (errors and warnings) and
+# the tail (bundle sizes, which bundlers print last)
+MAX_OUTPUT_CHARS = 512 * 1024
+
+# Error, output size, warning and circular dependency patterns in one alternation:
+#   src/components/Settings.tsx(42,10): error TS2339: Property 'user' does not exist
+#   dist/assets/index-abc123.js  245.8 kB │ gzip: 75.2 kB
+#   warning: some warning
+#   Circular dependency: src/a.ts -> src/b.ts -> src/a.ts   (common in Vite)
+BUILD_OUTPUT_PATTERN = re.compile(
+    r'(?P<error>(?P<error_file>[^\s]+\.tsx?)\((?P<error_line>\d+),\d+\):\s+error\s+\w+:\s+(?P<error_message>.+))'
+    r'|(?P<size>(?P<size_value>\d+\.?\d*)\s+(?P<size_unit>kB|MB))'
+    r'|(?P<warning>(?i:warning):\s+(?P<warning_message>.+))'
+    r'|(?P<circular>Circular dependency:\s+(?P<circular_details>.+))'
+)
+
+
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+@functools.lru_cache(maxsize=None)
+def load_package_scripts():
+    """Load the scripts section of package.json, or None if there is none
+
+    Cached so package.json is read at most once per run.
+    """
+    try:
+        with open('package.json', 'rb') as f:
+            return json.load(f).get('scripts', {})
+    except FileNotFoundError:
+        return None
+
 
 def find_build_command():
     """Find available build command"""
-    if not Path('package.json').exists():
+    scripts = load_package_scripts()
+    if scripts is None:
         return None
 
-    with open('package.json') as f:
-        pkg = json.load(f)
-        scripts = pkg.get('scripts', {})
-
-        # Check for common build script names
-        if 'build' in scripts:
-            return ['npm', 'run', 'build']
-        if 'build:prod' in scripts:
-            return ['npm', 'run', 'build:prod']
-        if 'compile' in scripts:
-            return ['npm', 'run', 'compile']
+    # Check for common build script names
+    if 'build' in scripts:
+        return ['npm', 'run', 'build']
+    if 'build:prod' in scripts:
+        return ['npm', 'run', 'build:prod']
+    if 'compile' in scripts:
+        return ['npm', 'run', 'compile']
 
     return None
 
@@ -76,51 +116,53 @@ def parse_build_output(output, exit_code, duration):
     """Parse build output for errors and warnings"""
     errors = []
     warnings = []
+    circular_warnings = []
     output_size = None
-
-    # Vite build success pattern
-    # "dist/index.html  0.45 kB │ gzip: 0.30 kB"
-    # "dist/assets/index-abc123.js  245.8 kB │ gzip: 75.2 kB"
-
-    # Extract output size
-    size_pattern = r'(\d+\.?\d*)\s+(kB|MB)'
-    size_matches = re.findall(size_pattern, output)
-    if size_matches:
-        # Get largest file size
-        sizes = [(float(m[0]), m[1]) for m in size_matches]
-        max_size, unit = max(sizes, key=lambda x: x[0])
-        output_size = f"{max_size} {unit}"
-
-    # TypeScript/Vite error pattern
-    # "src/components/Settings.tsx(42,10): error TS2339: Property 'user' does not exist"
-    error_pattern = r'([^\s]+\.tsx?)\((\d+),\d+\):\s+error\s+\w+:\s+(.+)'
-
-    for match in re.finditer(error_pattern, output):
-        errors.append({
-            "file": match.group(1),
-            "line": int(match.group(2)),
-            "message": match.group(3).strip()
-        })
-
-    # Warning patterns
-    warning_pattern = r'warning:\s+(.+)'
-    for match in re.finditer(warning_pattern, output, re.IGNORECASE):
-        warnings.append({
-            "message": match.group(1).strip()
-        })
-
-    # Circular dependency warnings (common in Vite)
-    circular_pattern = r'Circular dependency:\s+(.+)'
-    for match in re.finditer(circular_pattern, output):
-        warnings.append({
-            "message": "Circular dependency detected",
-            "details": match.group(1).strip()
-        })
+    max_size = None
+    truncated = len(output) > MAX_OUTPUT_CHARS
+
+    chunks = [output]
+    if truncated:
+        chunks = [output[:MAX_OUTPUT_CHARS], output[-MAX_OUTPUT_CHARS:]]
+
+    # Single pass over each chunk, dispatching on which alternative matched
+    for index, chunk in enumerate(chunks):
+        for match in BUILD_OUTPUT_PATTERN.finditer(chunk):
+            kind = match.lastgroup
+
+            # The tail of a truncated log only supplies the bundle sizes
+            if index and kind != "size":
+                continue
+
+            if kind == "error":
+                errors.append({
+                    "file": match.group("error_file"),
+                    "line": int(match.group("error_line")),
+                    "message": match.group("error_message").strip()
+                })
+            elif kind == "size":
+                # Keep the largest file size
+                size = float(match.group("size_value"))
+                if max_size is None or size > max_size:
+                    max_size = size
+                    output_size = f"{size} {match.group('size_unit')}"
+            elif kind == "warning":
+                warnings.append({
+                    "message": match.group("warning_message").strip()
+                })
+            else:
+                circular_warnings.append({
+                    "message": "Circular dependency detected",
+                    "details": match.group("circular_details").strip()
+                })
+
+    # Circular dependency warnings are listed after the other warnings
+    warnings.extend(circular_warnings)
 
     # Determine status
     if exit_code == 0:
         print(f"✅ Build passed in {duration}", file=sys.stderr)
-        return {
+        result = {
             "status": "success",
             "build": {
                 "status": "passing",
@@ -131,8 +173,13 @@ def parse_build_output(output, exit_code, duration):
             },
             "canProceed": True
         }
+        if truncated:
+            result["build"]["truncated"] = True
+        return result
     else:
-        print(f"❌ Build failed in {duration} with {len(errors)} error(s)", file=sys.stderr)
+        # Errors past the scanned head of a truncated log are not counted
+        error_count = f"{len(errors)}+" if truncated else len(errors)
+        print(f"❌ Build failed in {duration} with {error_count} error(s)", file=sys.stderr)
 
         result = {
             "status": "error",
@@ -143,8 +190,10 @@ def parse_build_output(output, exit_code, duration):
                 "warnings": warnings[:10]
             },
             "canProceed": False,
-            "details": f"Build failed with {len(errors) if errors else 'unknown'} error(s)"
+            "details": f"Build failed with {error_count if errors else 'unknown'} error(s)"
         }
+        if truncated:
+            result["build"]["truncated"] = True
 
         return result
 
@@ -153,7 +202,7 @@ def main():
     """Main entry point"""
     try:
         result = run_build()
-        print(json.dumps(result, indent=2))
+        print(dump_json(result))
 
         # Exit with appropriate code
         sys.exit(0 if result.get("status") == "success" else 1)
@@ -164,7 +213,7 @@ def main():
             "error": "Build timed out",
             "details": "Build took longer than 5 minutes"
         }
-        print(json.dumps(error_result, indent=2))
+        print(dump_json(error_result))
         sys.exit(1)
 
     except Exception as e:
@@ -173,7 +222,7 @@ def main():
             "error": str(e),
             "details": "Failed to run build"
         }
-        print(json.dumps(error_result, indent=2))
+        print(dump_json(error_result))
         sys.exit(1)
 
 
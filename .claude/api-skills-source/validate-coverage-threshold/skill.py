@@ -3,11 +3,25 @@
 Validate Coverage Threshold - Check coverage meets minimum thresholds
 """
 
+import heapq
 import json
 import re
 import sys
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:  # Optional - fall back to loading the whole report
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
+
+
+# Report at most this many of the least covered files
+MAX_UNCOVERED_FILES = 10
 
 # Default thresholds
 DEFAULT_THRESHOLDS = {
@@ -18,12 +32,22 @@ DEFAULT_THRESHOLDS = {
 }
 
 
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
 def load_coverage_data():
     """Load coverage data from available sources"""
     # Try JSON coverage report (preferred)
     json_path = Path('coverage/coverage-summary.json')
     if json_path.exists():
         print(f"→ Loading coverage from {json_path}", file=sys.stderr)
+        if ijson is not None:
+            # Per-file entries are streamed from the report on demand
+            return json_path, "json"
         with open(json_path) as f:
             return json.load(f), "json"
 
@@ -44,10 +68,23 @@ def load_coverage_data():
     return None, None
 
 
+def iter_coverage_entries(data):
+    """Yield (key, metrics) pairs from a coverage summary
+
+    data is either the parsed report or, when ijson is available, the path
+    of the report to stream entries from.
+    """
+    if isinstance(data, Path):
+        with open(data, 'rb') as f:
+            yield from ijson.kvitems(f, '', use_float=True)
+    else:
+        yield from data.items()
+
+
 def extract_coverage_metrics(data, source):
     """Extract coverage metrics from data"""
     if source == "json":
-        total = data.get("total", {})
+        total = next((metrics for key, metrics in iter_coverage_entries(data) if key == "total"), {})
         return {
             "overall": total.get("lines", {}).get("pct", 0),
             "statements": total.get("statements", {}).get("pct", 0),
@@ -89,22 +126,23 @@ def validate_thresholds(coverage, thresholds=None):
     if thresholds is None:
         thresholds = DEFAULT_THRESHOLDS
 
-    print("", file=sys.stderr)
-    print("Coverage metrics:", file=sys.stderr)
-    print(f"  Overall: {coverage['overall']}%", file=sys.stderr)
-    print(f"  Statements: {coverage['statements']}%", file=sys.stderr)
-    print(f"  Branches: {coverage['branches']}%", file=sys.stderr)
-    print(f"  Functions: {coverage['functions']}%", file=sys.stderr)
-
-    print("", file=sys.stderr)
-    print("Minimum thresholds:", file=sys.stderr)
-    print(f"  Overall: {thresholds['overall']}%", file=sys.stderr)
-    print(f"  Statements: {thresholds['statements']}%", file=sys.stderr)
-    print(f"  Branches: {thresholds['branches']}%", file=sys.stderr)
-    print(f"  Functions: {thresholds['functions']}%", file=sys.stderr)
-
-    print("", file=sys.stderr)
-    print("→ Validating coverage thresholds...", file=sys.stderr)
+    # Report lines are collected and written to stderr in one go
+    out = [
+        "",
+        "Coverage metrics:",
+        f"  Overall: {coverage['overall']}%",
+        f"  Statements: {coverage['statements']}%",
+        f"  Branches: {coverage['branches']}%",
+        f"  Functions: {coverage['functions']}%",
+        "",
+        "Minimum thresholds:",
+        f"  Overall: {thresholds['overall']}%",
+        f"  Statements: {thresholds['statements']}%",
+        f"  Branches: {thresholds['branches']}%",
+        f"  Functions: {thresholds['functions']}%",
+        "",
+        "→ Validating coverage thresholds..."
+    ]
 
     failures = []
     passed = True
@@ -122,9 +160,11 @@ def validate_thresholds(coverage, thresholds=None):
             msg = f"{name}:{actual}%<{threshold}%"
             failures.append(msg)
             passed = False
-            print(f"❌ {name.capitalize()} coverage below threshold: {actual}% < {threshold}%", file=sys.stderr)
+            out.append(f"❌ {name.capitalize()} coverage below threshold: {actual}% < {threshold}%")
         else:
-            print(f"✅ {name.capitalize()} coverage: {actual}% ≥ {threshold}%", file=sys.stderr)
+            out.append(f"✅ {name.capitalize()} coverage: {actual}% ≥ {threshold}%")
+
+    sys.stderr.write("\n".join(out) + "\n")
 
     return passed, failures
 
@@ -136,7 +176,7 @@ def find_uncovered_files(data, threshold=80):
 
     uncovered = []
 
-    for file_path, metrics in data.items():
+    for file_path, metrics in iter_coverage_entries(data):
         if file_path == "total":
             continue
 
@@ -147,11 +187,8 @@ def find_uncovered_files(data, threshold=80):
                 "coverage": line_coverage
             })
 
-    # Sort by coverage (lowest first)
-    uncovered.sort(key=lambda x: x["coverage"])
-
-    # Limit to top 10
-    return uncovered[:10]
+    # Lowest coverage first, without sorting the whole list
+    return heapq.nsmallest(MAX_UNCOVERED_FILES, uncovered, key=lambda x: x["coverage"])
 
 
 def validate_coverage_threshold(thresholds=None):
@@ -183,7 +220,7 @@ def validate_coverage_threshold(thresholds=None):
     passed, failures = validate_thresholds(coverage, thresholds)
 
     # Find uncovered files
-    uncovered_files = find_uncovered_files(data) if not passed else []
+    uncovered_files = find_uncovered_files(data) if not passed and source == "json" else []
 
     # Build result
     result = {
@@ -219,7 +256,7 @@ def main():
             }
 
         result = validate_coverage_threshold(thresholds)
-        print(json.dumps(result, indent=2))
+        print(dump_json(result))
 
         # Exit with appropriate code
         # Note: Coverage validation returns "warning" not "error" for failures
@@ -231,7 +268,7 @@ def main():
             "error": str(e),
             "details": "Failed to validate coverage threshold"
         }
-        print(json.dumps(error_result, indent=2))
+        print(dump_json(error_result))
         sys.exit(1)
 
 
@@ -7,15 +7,44 @@ import subprocess
 import re
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
+
 
 # Conventional commit types
 VALID_COMMIT_TYPES = ['feat', 'fix', 'docs', 'style', 'refactor', 'test', 'chore', 'perf', 'ci', 'build', 'revert']
+VALID_COMMIT_PREFIXES = tuple(VALID_COMMIT_TYPES)
 
 # Sensitive file patterns to warn about
 SENSITIVE_PATTERNS = ['.env', 'credentials', 'secrets', '.pem', '.key', 'password', 'token']
 
+# All sensitive patterns as one case-insensitive alternation, matched against raw path bytes
+SENSITIVE_FILE_PATTERN = re.compile(
+    b'|'.join(re.escape(pattern.encode()) for pattern in SENSITIVE_PATTERNS),
+    re.IGNORECASE
+)
+
+# Valid branch prefixes: feat/*, fix/*, chore/*, etc. (claude/* for Claude Code branches)
+BRANCH_NAME_PATTERN = re.compile(r'^(?P<kind>feat|fix|chore|refactor|test|docs|hotfix|release|claude)/[\w-]+')
+
+# Main branch names (always valid)
+MAIN_BRANCHES = frozenset({'main', 'master', 'development', 'develop'})
+
+# Conventional Commits subject: type(scope): description
+CONVENTIONAL_COMMIT_PATTERN = re.compile(r'^(feat|fix|docs|style|refactor|test|chore|perf|ci|build|revert)(\([^\)]+\))?:\s*.+')
+
+
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 
 def is_git_repo():
     """Check if current directory is a git repository"""
@@ -26,9 +55,9 @@ def is_git_repo():
 
 
 def get_current_branch():
-    """Get current branch name"""
+    """Get current branch name (None on a detached HEAD)"""
     result = subprocess.run(
-        ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+        ['git', 'symbolic-ref', '--short', '-q', 'HEAD'],
         capture_output=True,
         text=True
     )
@@ -40,27 +69,13 @@ def validate_branch_name(branch_name):
     if not branch_name:
         return {"valid": False, "problem": "No branch found"}
 
-    # Check for valid patterns: feat/*, fix/*, chore/*, etc.
-    valid_patterns = [
-        r'^feat/[\w-]+',
-        r'^fix/[\w-]+',
-        r'^chore/[\w-]+',
-        r'^refactor/[\w-]+',
-        r'^test/[\w-]+',
-        r'^docs/[\w-]+',
-        r'^hotfix/[\w-]+',
-        r'^release/[\w-]+',
-        r'^claude/[\w-]+'  # Claude Code branches
-    ]
-
-    for pattern in valid_patterns:
-        if re.match(pattern, branch_name):
-            return {"valid": True, "pattern": pattern}
-
-    # Check for main/master/development (always valid)
-    if branch_name in ['main', 'master', 'development', 'develop']:
+    if branch_name in MAIN_BRANCHES:
         return {"valid": True, "pattern": "main branch"}
 
+    match = BRANCH_NAME_PATTERN.match(branch_name)
+    if match:
+        return {"valid": True, "pattern": rf'^{match.group("kind")}/[\w-]+'}
+
     return {
         "valid": False,
         "pattern": None,
@@ -70,37 +85,34 @@ def validate_branch_name(branch_name):
 
 def get_recent_commits(count=10):
     """Get recent commit messages"""
+    # NUL-separated hash/subject pairs - subjects may contain any other character
     result = subprocess.run(
-        ['git', 'log', f'-{count}', '--pretty=format:%H|%s'],
-        capture_output=True,
-        text=True
+        ['git', 'log', f'-{count}', '-z', '--pretty=format:%H%x00%s'],
+        capture_output=True
     )
 
-    if result.returncode != 0:
+    if result.returncode != 0 or not result.stdout:
         return []
 
+    # Parse bytes - only the short hash and subject of each commit get decoded
+    parts = result.stdout.split(b'\0')
     commits = []
-    for line in result.stdout.split('\n'):
-        if '|' in line:
-            commit_hash, message = line.split('|', 1)
-            commits.append({"hash": commit_hash[:7], "message": message})
+    for commit_hash, message in zip(parts[0::2], parts[1::2]):
+        commits.append({"hash": commit_hash[:7].decode('ascii'), "message": message.decode('utf-8', 'replace')})
 
     return commits
 
 
 def validate_commit_message(message):
     """Validate commit message follows conventions"""
-    # Conventional Commits pattern: type(scope): description
-    conventional_pattern = r'^(feat|fix|docs|style|refactor|test|chore|perf|ci|build|revert)(\([^\)]+\))?:\s*.+'
-
-    if re.match(conventional_pattern, message):
+    if CONVENTIONAL_COMMIT_PATTERN.match(message):
         return {"valid": True}
 
     # Check for common issues
     if len(message) > 72:
         return {"valid": False, "problem": "Subject line too long (>72 chars)"}
 
-    if not any(message.startswith(t) for t in VALID_COMMIT_TYPES):
+    if not message.startswith(VALID_COMMIT_PREFIXES):
         return {"valid": False, "problem": f"Missing type prefix ({'/'.join(VALID_COMMIT_TYPES[:5])}/etc)"}
 
     if ':' not in message:
@@ -112,34 +124,33 @@ def validate_commit_message(message):
 def check_working_directory():
     """Check for uncommitted changes"""
     result = subprocess.run(
-        ['git', 'status', '--porcelain'],
-        capture_output=True,
-        text=True
+        ['git', 'status', '--porcelain', '-z'],
+        capture_output=True
     )
 
     if result.returncode != 0:
         return "unknown"
 
-    return "clean" if not result.stdout.strip() else "dirty"
+    return "clean" if not result.stdout else "dirty"
 
 
 def find_sensitive_files():
     """Find untracked files that might be sensitive"""
+    # NUL-separated bytes - safe for any filename, and only matches get decoded
     result = subprocess.run(
-        ['git', 'ls-files', '--others', '--exclude-standard'],
-        capture_output=True,
-        text=True
+        ['git', 'ls-files', '--others', '--exclude-standard', '-z'],
+        capture_output=True
     )
 
     if result.returncode != 0:
         return []
 
-    untracked_files = result.stdout.strip().split('\n') if result.stdout.strip() else []
+    untracked_files = result.stdout.split(b'\0')
 
     sensitive = []
     for file in untracked_files:
-        if any(pattern in file.lower() for pattern in SENSITIVE_PATTERNS):
-            sensitive.append(file)
+        if SENSITIVE_FILE_PATTERN.search(file):
+            sensitive.append(file.decode('utf-8', 'replace'))
 
     return sensitive
 
@@ -153,12 +164,19 @@ def validate_git_hygiene():
             "suggestion": "Initialize git: git init"
         }
 
-    # Get current branch
-    branch_name = get_current_branch()
+    # The git queries are independent of each other, so run them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        branch_future = executor.submit(get_current_branch)
+        commits_future = executor.submit(get_recent_commits)
+        working_dir_future = executor.submit(check_working_directory)
+        sensitive_future = executor.submit(find_sensitive_files)
+
+    # Validate current branch
+    branch_name = branch_future.result()
     branch_validation = validate_branch_name(branch_name)
 
     # Validate recent commits
-    commits = get_recent_commits()
+    commits = commits_future.result()
     valid_commits = 0
     invalid_commits = 0
     commit_issues = []
@@ -176,10 +194,10 @@ def validate_git_hygiene():
             })
 
     # Check working directory
-    working_dir_status = check_working_directory()
+    working_dir_status = working_dir_future.result()
 
     # Find sensitive files
-    sensitive_files = find_sensitive_files()
+    sensitive_files = sensitive_future.result()
 
     # Build result
     issues_count = invalid_commits + (0 if branch_validation["valid"] else 1) + len(sensitive_files)
@@ -223,7 +241,7 @@ def main():
     """Main entry point"""
     try:
         result = validate_git_hygiene()
-        print(json.dumps(result, indent=2))
+        print(dump_json(result))
 
         # Print summary
         if result.get("status") == "success":
@@ -241,7 +259,7 @@ def main():
             "error": str(e),
             "details": "Failed to validate git hygiene"
         }
-        print(json.dumps(error_result, indent=2))
+        print(dump_json(error_result))
         sys.exit(1)
 
 
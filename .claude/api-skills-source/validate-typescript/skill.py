@@ -4,28 +4,90 @@ Validate TypeScript - Run tsc --noEmit and return structured results
 """
 
 import subprocess
+import functools
 import re
 import json
+import shutil
 import sys
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional - fall back to the standard library json module
+    orjson = None
 
+
+# Incremental build info - lets tsc skip re-checking unchanged files on the next run
+TS_BUILD_INFO_PATH = Path('node_modules/.cache/validate-typescript.tsbuildinfo')
+
+# TypeScript error, with the file it is in when there is one:
+# "src/components/Settings.tsx(42,10): error TS2339: Property 'user' does not exist"
+# "error TS5058: The specified path does not exist: 'tsconfig.json'."
+TS_ERROR_PATTERN = re.compile(r'(?:^(?P<file>.+\.tsx?)\(\d+,\d+\):.*?)?error TS(?P<code>\d+):', re.MULTILINE)
+
+# Printed by tsc --watch at the end of every check:
+# "[10:42:01 AM] Found 2 errors. Watching for file changes."
+WATCH_DONE_PATTERN = re.compile(r'Found (\d+) errors?\. Watching for file changes\.')
+
+
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def dump_json_line(data):
+    """Serialize data as a single line of JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+@functools.lru_cache(maxsize=None)
 def find_tsc_command():
-    """Find available TypeScript compiler command"""
+    """Find available TypeScript compiler command (PATH is only scanned once)"""
     # Try tsc in PATH
-    if subprocess.run(['which', 'tsc'], capture_output=True).returncode == 0:
+    if shutil.which('tsc') is not None:
         return ['tsc']
 
     # Try npx tsc
-    if subprocess.run(['which', 'npx'], capture_output=True).returncode == 0:
+    if shutil.which('npx') is not None:
         return ['npx', 'tsc']
 
     return None
 
 
-def run_typescript_check():
-    """Run TypeScript type checking"""
+def tsc_args(use_cache=True):
+    """Arguments for a type-check-only tsc run"""
+    args = ['--noEmit']
+    # Only cache inside an existing node_modules - tsc creates .cache/ itself
+    if use_cache and TS_BUILD_INFO_PATH.parents[1].is_dir():
+        args += ['--incremental', '--tsBuildInfoFile', str(TS_BUILD_INFO_PATH)]
+    return args
+
+
+def passing_result():
+    """Result for a check without errors"""
+    return {
+        "status": "success",
+        "typescript": {
+            "status": "passing",
+            "errors": {
+                "total": 0,
+                "type": 0,
+                "syntax": 0,
+                "import": 0
+            },
+            "files": []
+        },
+        "canProceed": True
+    }
+
+
+def run_typescript_check(use_cache=True):
+    """Run TypeScript type checking (incrementally unless use_cache is False)"""
     tsc_cmd = find_tsc_command()
 
     if not tsc_cmd:
@@ -42,53 +104,50 @@ def run_typescript_check():
     # Run tsc --noEmit
     print(f"→ Running TypeScript type check with: {' '.join(tsc_cmd)}", file=sys.stderr)
 
-    result = subprocess.run(
-        tsc_cmd + ['--noEmit'],
-        capture_output=True,
+    # tsc reports diagnostics on stdout; merging stderr in only adds Node warnings.
+    # Output is read as it is produced, keeping only the error lines
+    process = subprocess.Popen(
+        tsc_cmd + tsc_args(use_cache),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True
     )
 
-    output = result.stdout + result.stderr
+    error_lines = []
+    with process:
+        for line in process.stdout:
+            if 'error TS' in line:
+                error_lines.append(line)
 
     # Parse results
-    if result.returncode == 0:
+    if process.returncode == 0:
         print("✅ TypeScript validation passed", file=sys.stderr)
-        return {
-            "status": "success",
-            "typescript": {
-                "status": "passing",
-                "errors": {
-                    "total": 0,
-                    "type": 0,
-                    "syntax": 0,
-                    "import": 0
-                },
-                "files": []
-            },
-            "canProceed": True
-        }
+        return passing_result()
     else:
         print("❌ TypeScript validation failed", file=sys.stderr)
-        return parse_typescript_errors(output)
+        return parse_typescript_errors(''.join(error_lines))
 
 
 def parse_typescript_errors(output):
     """Parse TypeScript error output"""
-    # Find all error lines
-    error_pattern = r'error TS(\d+):'
-    errors = re.findall(error_pattern, output)
+    total_errors = type_errors = syntax_errors = import_errors = 0
+    files = set()
 
-    total_errors = len(errors)
+    # Single pass: count and categorize errors, collecting the files they are in
+    for match in TS_ERROR_PATTERN.finditer(output):
+        total_errors += 1
+        if match.group('file'):
+            files.add(match.group('file'))
 
-    # Categorize errors
-    type_errors = len([e for e in errors if e.startswith('2') and e != '2307'])
-    syntax_errors = len([e for e in errors if e.startswith('1')])
-    import_errors = len([e for e in errors if e == '2307'])
+        code = match.group('code')
+        if code == '2307':
+            import_errors += 1
+        elif code[0] == '2':
+            type_errors += 1
+        elif code[0] == '1':
+            syntax_errors += 1
 
-    # Extract files with errors
-    file_pattern = r'^(.+\.tsx?)\(\d+,\d+\):'
-    file_matches = re.findall(file_pattern, output, re.MULTILINE)
-    error_files = sorted(set(file_matches))
+    error_files = sorted(files)
 
     print(f"   Errors: {total_errors}", file=sys.stderr)
     print(f"   Type errors: {type_errors}", file=sys.stderr)
@@ -112,11 +171,70 @@ def parse_typescript_errors(output):
     }
 
 
+def watch_typescript(use_cache=True):
+    """Keep one tsc --watch process running and print a result after every check
+
+    Node startup and program construction are paid once; each file change
+    then only costs an incremental re-check. Results are printed as one
+    JSON object per line until interrupted.
+    """
+    tsc_cmd = find_tsc_command()
+
+    if not tsc_cmd:
+        print(dump_json_line({
+            "status": "error",
+            "error": "TypeScript not available",
+            "suggestion": "Install TypeScript: npm install --save-dev typescript"
+        }))
+        return 1
+
+    print(f"→ Watching TypeScript with: {' '.join(tsc_cmd)} --watch", file=sys.stderr)
+
+    process = subprocess.Popen(
+        tsc_cmd + tsc_args(use_cache) + ['--watch', '--preserveWatchOutput', '--pretty', 'false'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+
+    try:
+        # Everything up to the "Watching for file changes." line is one check's output
+        check_output = []
+        for line in process.stdout:
+            done_match = WATCH_DONE_PATTERN.search(line)
+            if not done_match:
+                check_output.append(line)
+                continue
+
+            if done_match.group(1) == '0':
+                print("✅ TypeScript validation passed", file=sys.stderr)
+                result = passing_result()
+            else:
+                print("❌ TypeScript validation failed", file=sys.stderr)
+                result = parse_typescript_errors(''.join(check_output))
+
+            print(dump_json_line(result), flush=True)
+            check_output = []
+    except KeyboardInterrupt:
+        pass
+    finally:
+        process.terminate()
+        process.wait()
+
+    return 0
+
+
 def main():
     """Main entry point"""
+    # --no-cache forces a clean, non-incremental check (e.g. in CI)
+    use_cache = "--no-cache" not in sys.argv[1:]
+
+    if "--watch" in sys.argv[1:]:
+        sys.exit(watch_typescript(use_cache))
+
     try:
-        result = run_typescript_check()
-        print(json.dumps(result, indent=2))
+        result = run_typescript_check(use_cache)
+        print(dump_json(result))
 
         # Exit with appropriate code
         sys.exit(0 if result.get("status") == "success" else 1)
@@ -127,7 +245,7 @@ def main():
             "error": str(e),
             "details": "Failed to run TypeScript validation"
         }
-        print(json.dumps(error_result, indent=2))
+        print(dump_json(error_result))
         sys.exit(1)
 
 